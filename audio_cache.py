@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import librosa
+
+from playback_backend import to_mixer_format
+
+# Default location of the cache, next to output.wav
+DEFAULT_CACHE_DIR = "decoded_cache"
+
+# Default size limit of the cache: 2 GiB of decoded PCM
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+def decode_audio(path):
+    """
+    Decode an audio file of any format supported by librosa (FLAC, MP3, OGG, ...) to 16-bit PCM.
+
+    Args:
+        path (str): The path of the audio file.
+
+    Returns:
+        tuple: (sample_rate, samples) where samples is an int16 array of shape (frames, channels).
+    """
+    sound_data, sample_rate = librosa.load(path, sr=None, mono=False)
+    sound_data = np.atleast_2d(sound_data).T
+    sound_data = np.clip(sound_data, -1, 1) * np.iinfo(np.int16).max
+    return int(sample_rate), sound_data.astype(np.int16)
+
+
+class DecodedAudioCache:
+    """
+    Content-addressed on-disk cache of decoded audio.
+
+    Every file is decoded at most once per mixer format. The PCM is stored already converted to
+    the mixer's sample rate and channel count, as a .npy file named after the hash of the encoded
+    file's content and that format, so later opens are a zero-copy memory map that needs no
+    resampling. The least recently used entries are evicted when the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): Directory holding the cached PCM and the index.
+            max_bytes (int): Size limit of the cached PCM in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        """
+        Read the index, which maps source files to content hashes and lists the cached entries.
+        """
+        try:
+            with open(self.index_path) as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {"paths": {}, "entries": {}}
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as index_file:
+            json.dump(self.index, index_file)
+        os.replace(tmp_path, self.index_path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".npy")
+
+    def content_hash(self, path):
+        """
+        Return the SHA-256 of the file content.
+
+        The hash is remembered per path, size and modification time, so an unchanged file is
+        only read once.
+
+        Args:
+            path (str): The path of the audio file.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.index["paths"].get(path)
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime_ns:
+            return known["digest"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as audio_file:
+            for chunk in iter(lambda: audio_file.read(1 << 20), b""):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+
+        self.index["paths"][path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": digest}
+        self._write_index()
+        return digest
+
+    def open(self, path, frequency, channels):
+        """
+        Return the samples of an audio file in the mixer format, decoding it only if it is not cached yet.
+
+        Args:
+            path (str): The path of the audio file.
+            frequency (int): Sample rate of the mixer.
+            channels (int): Number of channels of the mixer.
+
+        Returns:
+            tuple: (sample_rate, samples) where sample_rate is the mixer's and samples is a
+                read-only memory-mapped int16 array of shape (frames, channels).
+        """
+        digest = self.content_hash(path)
+        key = "{}-{}-{}".format(digest, frequency, channels)
+        entry_path = self._entry_path(key)
+
+        if key not in self.index["entries"] or not os.path.exists(entry_path):
+            sample_rate, sound_data = decode_audio(path)
+            sound_data = to_mixer_format(sound_data, sample_rate, frequency, channels)
+
+            # Write under a temporary name first so an interrupted write never looks like a valid entry
+            tmp_path = entry_path + ".tmp"
+            cached = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.int16, shape=sound_data.shape)
+            cached[:] = sound_data
+            cached.flush()
+            del cached
+            os.replace(tmp_path, entry_path)
+
+            self.index["entries"][key] = {"digest": digest}
+            self._write_index()
+            self.evict(keep=key)
+        else:
+            # Mark the entry as recently used for eviction
+            os.utime(entry_path)
+
+        return frequency, np.load(entry_path, mmap_mode="r")
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+
+        Args:
+            keep (str): Key of an entry that must not be removed.
+        """
+        entries = []
+        for key in list(self.index["entries"]):
+            entry_path = self._entry_path(key)
+            if not os.path.exists(entry_path):
+                del self.index["entries"][key]
+                continue
+            stat = os.stat(entry_path)
+            entries.append((stat.st_mtime, stat.st_size, key))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            os.remove(self._entry_path(key))
+            del self.index["entries"][key]
+            total_bytes -= size
+
+        cached_digests = {entry.get("digest") for entry in self.index["entries"].values()}
+        self.index["paths"] = {path: known for path, known in self.index["paths"].items()
+                               if known["digest"] in cached_digests}
+        self._write_index()
@@ -0,0 +1,153 @@
+import numpy as np
+
+
+class AudioIndex:
+    """
+    Compact index of block energy, silent spans and onsets of a recording.
+
+    The index is built in one vectorized pass over the samples, chunk by chunk, so that
+    long recordings never need a full floating point copy in memory. Afterwards all
+    navigation queries use binary search over the index and never touch the samples again.
+    """
+
+    def __init__(self, energy_db, silent_starts, silent_ends, events, sample_rate, block_size, total_samples):
+        """
+        Args:
+            energy_db (np.ndarray): RMS energy of every block in dBFS (float16).
+            silent_starts (np.ndarray): First block of every silent span (int32, sorted).
+            silent_ends (np.ndarray): Block after the last block of every silent span (int32, sorted).
+            events (np.ndarray): Blocks where sound starts after silence or an onset occurs (int32, sorted).
+            sample_rate (int): Sample rate of the indexed samples.
+            block_size (int): Number of samples per block.
+            total_samples (int): Number of samples (frames) in the indexed recording.
+        """
+        self.energy_db = energy_db
+        self.silent_starts = silent_starts
+        self.silent_ends = silent_ends
+        self.events = events
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.total_samples = total_samples
+
+    @classmethod
+    def build(cls, sound_data, sample_rate, block_size=1024, chunk_blocks=4096, silence_db=-50.0,
+              min_silence_seconds=0.3, onset_db=9.0):
+        """
+        Build the index from sample data in a single chunked pass.
+
+        Args:
+            sound_data (np.ndarray): Samples, shape (frames,) or (frames, channels).
+            sample_rate (int): Sample rate of sound_data.
+            block_size (int): Number of samples per analysis block.
+            chunk_blocks (int): Number of blocks converted to floating point at a time.
+            silence_db (float): Blocks quieter than this (dBFS) are considered silent.
+            min_silence_seconds (float): Shorter runs of silent blocks are not reported as silent spans.
+            onset_db (float): Rise in energy between consecutive blocks that counts as an onset.
+
+        Returns:
+            AudioIndex: The built index.
+        """
+        if sound_data.ndim == 1:
+            sound_data = sound_data[:, np.newaxis]
+        total_samples = sound_data.shape[0]
+
+        # Full scale of the sample format, so energy is in dBFS
+        if np.issubdtype(sound_data.dtype, np.integer):
+            full_scale = float(np.iinfo(sound_data.dtype).max)
+        else:
+            full_scale = 1.0
+
+        n_blocks = -(-total_samples // block_size)
+        energy_db = np.empty(n_blocks, dtype=np.float16)
+        chunk_samples = chunk_blocks * block_size
+
+        for start in range(0, total_samples, chunk_samples):
+            chunk = sound_data[start:start + chunk_samples].astype(np.float32) / full_scale
+            blocks_in_chunk = -(-chunk.shape[0] // block_size)
+
+            # Zero-pad the last partial block so the chunk reshapes into whole blocks
+            padding = blocks_in_chunk * block_size - chunk.shape[0]
+            if padding:
+                chunk = np.concatenate([chunk, np.zeros((padding, chunk.shape[1]), dtype=np.float32)])
+
+            mean_square = np.mean(np.square(chunk).reshape(blocks_in_chunk, -1), axis=1)
+            first_block = start // block_size
+            energy_db[first_block:first_block + blocks_in_chunk] = 10 * np.log10(mean_square + 1e-12)
+
+        # Silent spans are runs of quiet blocks, found from the edges of the boolean mask
+        silent = energy_db < silence_db
+        edges = np.diff(np.concatenate([[False], silent, [False]]).astype(np.int8))
+        silent_starts = np.flatnonzero(edges == 1)
+        silent_ends = np.flatnonzero(edges == -1)
+        min_silence_blocks = max(int(min_silence_seconds * sample_rate / block_size), 1)
+        long_enough = silent_ends - silent_starts >= min_silence_blocks
+        silent_starts = silent_starts[long_enough].astype(np.int32)
+        silent_ends = silent_ends[long_enough].astype(np.int32)
+
+        # Onsets are sharp rises in energy that end above the silence threshold
+        flux = np.diff(energy_db.astype(np.float32), prepend=np.float32(energy_db[0]) if n_blocks else 0)
+        onsets = np.flatnonzero((flux > onset_db) & ~silent)
+
+        resumes = silent_ends[silent_ends < n_blocks]
+        events = np.union1d(onsets, resumes).astype(np.int32)
+
+        return cls(energy_db, silent_starts, silent_ends, events, sample_rate, block_size, total_samples)
+
+    @property
+    def duration(self):
+        """
+        Duration of the indexed recording in seconds.
+        """
+        return self.total_samples / self.sample_rate
+
+    def _block_to_seconds(self, block):
+        return min(block * self.block_size, self.total_samples) / self.sample_rate
+
+    def _seconds_to_block(self, seconds):
+        return int(seconds * self.sample_rate) // self.block_size
+
+    def next_event(self, position_seconds):
+        """
+        Find the next onset or the next end of silence after the given position.
+
+        Args:
+            position_seconds (float): The current playback position in seconds.
+
+        Returns:
+            float: The time of the next event in seconds, or None if there is none.
+        """
+        i = np.searchsorted(self.events, self._seconds_to_block(position_seconds), side="right")
+        if i == len(self.events):
+            return None
+        return self._block_to_seconds(self.events[i])
+
+    def is_silent(self, position_seconds):
+        """
+        Check whether the given position lies inside a silent span.
+
+        Args:
+            position_seconds (float): The position in seconds.
+
+        Returns:
+            bool: True if the position is inside a silent span.
+        """
+        block = self._seconds_to_block(position_seconds)
+        i = np.searchsorted(self.silent_starts, block, side="right") - 1
+        return bool(i >= 0 and block < self.silent_ends[i])
+
+    def trim_suggestion(self):
+        """
+        Suggest start and end times that cut leading and trailing silence.
+
+        Returns:
+            tuple: (start_seconds, end_seconds) of the non-silent part of the recording.
+        """
+        n_blocks = len(self.energy_db)
+        start_block, end_block = 0, n_blocks
+        if len(self.silent_starts) and self.silent_starts[0] == 0:
+            start_block = self.silent_ends[0]
+        if len(self.silent_ends) and self.silent_ends[-1] == n_blocks:
+            end_block = self.silent_starts[-1]
+        if start_block >= end_block:
+            return 0.0, 0.0
+        return self._block_to_seconds(start_block), self._block_to_seconds(end_block)
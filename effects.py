@@ -0,0 +1,21 @@
+import scipy.signal as signal
+
+
+# Per-channel effect kernels for parallel_dsp.process_channels. Only compute-bound effects belong
+# here; memory-bound ones such as volume and fades are cheaper as a single numpy operation in-process.
+# Every kernel takes a 1-D float64 slice x of one channel and the index of its first sample.
+
+
+def resample_kernel(x, start_index, num):
+    """
+    Resample the channel to num samples (used for the tempo change).
+    """
+    return signal.resample(x, num)
+
+
+def filtfilt_kernel(x, start_index, b, a):
+    """
+    Apply a zero-phase IIR filter with coefficients b and a.
+    """
+    return signal.filtfilt(b, a, x)
+
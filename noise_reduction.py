@@ -0,0 +1,233 @@
+import os
+import zipfile
+
+import numpy as np
+import scipy.signal as signal
+from scipy.io import wavfile
+
+from parallel_dsp import process_channels
+
+# Default location of the persisted noise profile, next to output.wav
+DEFAULT_PROFILE_PATH = "noise_profile.npz"
+
+# Small value added to magnitudes before taking the logarithm
+EPSILON = 1e-10
+
+
+class NoiseProfile:
+    """
+    Per-frequency noise threshold learned from a noise-only region of a recording.
+    """
+
+    def __init__(self, threshold_db, sample_rate, n_fft=2048, hop_length=512):
+        """
+        Args:
+            threshold_db (np.ndarray): Gate threshold in dB for every STFT frequency bin.
+            sample_rate (int): Sample rate of the audio the profile was learned from.
+            n_fft (int): STFT window length in samples.
+            hop_length (int): Number of samples between consecutive STFT frames.
+        """
+        self.threshold_db = np.asarray(threshold_db, dtype=np.float64)
+        self.sample_rate = int(sample_rate)
+        self.n_fft = int(n_fft)
+        self.hop_length = int(hop_length)
+
+    def save(self, path=DEFAULT_PROFILE_PATH):
+        """
+        Save the profile to a .npz file so it can be reused without re-analysis.
+
+        Args:
+            path (str): The path of the profile file.
+        """
+        np.savez(path, threshold_db=self.threshold_db, sample_rate=self.sample_rate,
+                 n_fft=self.n_fft, hop_length=self.hop_length)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PROFILE_PATH):
+        """
+        Load a profile previously written by save().
+
+        Args:
+            path (str): The path of the profile file.
+
+        Returns:
+            NoiseProfile: The loaded profile, or None if the file does not exist or cannot be read,
+                for example because it is truncated or was written by an older version.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return cls(data["threshold_db"], int(data["sample_rate"]),
+                           int(data["n_fft"]), int(data["hop_length"]))
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+
+def _to_channels_first(sound_data):
+    """
+    Convert (frames,) or (frames, channels) sample data to a float (channels, frames) array.
+    """
+    x = np.asarray(sound_data, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, np.newaxis]
+    return np.ascontiguousarray(x.T)
+
+
+def _stft(x, n_fft, hop_length):
+    """
+    Vectorized STFT over the last axis of x. Returns an array of shape (..., freqs, frames).
+    """
+    _, _, spectrum = signal.stft(x, nperseg=n_fft, noverlap=n_fft - hop_length, axis=-1)
+    return spectrum
+
+
+def learn_noise_profile(noise_data, sample_rate, n_fft=2048, hop_length=512, n_std_thresh=1.5):
+    """
+    Learn a noise profile from a noise-only region of a recording.
+
+    The threshold of every frequency bin is the mean plus n_std_thresh standard deviations
+    of the noise magnitude (in dB), pooled over all frames and channels.
+
+    Args:
+        noise_data (np.ndarray): Noise samples, shape (frames,) or (frames, channels).
+        sample_rate (int): Sample rate of noise_data.
+        n_fft (int): STFT window length in samples.
+        hop_length (int): Number of samples between consecutive STFT frames.
+        n_std_thresh (float): How many standard deviations above the noise mean a bin must be to pass.
+
+    Returns:
+        NoiseProfile: The learned profile.
+    """
+    x = _to_channels_first(noise_data)
+    if x.shape[1] < n_fft:
+        raise ValueError("The noise region must be at least {} samples long.".format(n_fft))
+
+    magnitude_db = 20 * np.log10(np.abs(_stft(x, n_fft, hop_length)) + EPSILON)
+
+    # Pool channels and frames: (channels, freqs, frames) -> (freqs, channels * frames)
+    magnitude_db = np.moveaxis(magnitude_db, 1, 0).reshape(magnitude_db.shape[1], -1)
+    threshold_db = magnitude_db.mean(axis=1) + n_std_thresh * magnitude_db.std(axis=1)
+
+    return NoiseProfile(threshold_db, sample_rate, n_fft, hop_length)
+
+
+def _smoothing_kernel(freq_bins, time_frames):
+    """
+    Triangular 2D kernel used to soften the edges of the gate mask.
+    """
+    freq = np.concatenate([np.linspace(0, 1, freq_bins + 1, endpoint=False)[1:],
+                           np.linspace(1, 0, freq_bins + 2)[:-1]])
+    time = np.concatenate([np.linspace(0, 1, time_frames + 1, endpoint=False)[1:],
+                           np.linspace(1, 0, time_frames + 2)[:-1]])
+    kernel = np.outer(freq, time)
+    return kernel / kernel.sum()
+
+
+def _gate_block(x, threshold_db, n_fft, hop_length, prop_decrease, freq_smooth, time_smooth):
+    """
+    Apply spectral gating to a (channels, frames) block and resynthesize it with overlap-add.
+    """
+    # A block shorter than one window is zero-padded to a full window, so its spectrum has the
+    # frequency bins of the threshold, and trimmed back below
+    frames = x.shape[1]
+    if frames < n_fft:
+        x = np.pad(x, ((0, 0), (0, n_fft - frames)))
+
+    spectrum = _stft(x, n_fft, hop_length)
+    magnitude_db = 20 * np.log10(np.abs(spectrum) + EPSILON)
+
+    # 1 where the signal rises above the noise floor, 0 where it is considered noise
+    mask = (magnitude_db > threshold_db[:, np.newaxis]).astype(np.float64)
+    kernel = _smoothing_kernel(freq_smooth, time_smooth)
+    mask = signal.fftconvolve(mask, kernel[np.newaxis], mode="same", axes=(1, 2))
+    gain = 1 - prop_decrease * (1 - np.clip(mask, 0, 1))
+
+    _, y = signal.istft(spectrum * gain, nperseg=n_fft, noverlap=n_fft - hop_length,
+                        time_axis=-1, freq_axis=-2)
+    return y[:, :frames]
+
+
+def _context_samples(n_fft, hop_length, time_smooth):
+    """
+    Samples of context a block needs on each side to be gated exactly as in the whole signal.
+    """
+    return (n_fft // hop_length + time_smooth + 1) * hop_length
+
+
+def _gate_channel(x, start_index, threshold_db, n_fft, hop_length, prop_decrease, freq_smooth, time_smooth,
+                  block_samples):
+    """
+    Spectral-gating kernel for parallel_dsp.process_channels: gate one channel block by block.
+    """
+    total_samples = len(x)
+    context = _context_samples(n_fft, hop_length, time_smooth)
+    cleaned = np.empty_like(x)
+    for start in range(0, total_samples, block_samples):
+        end = min(start + block_samples, total_samples)
+        low, high = max(start - context, 0), min(end + context, total_samples)
+        result = _gate_block(x[np.newaxis, low:high], threshold_db, n_fft, hop_length, prop_decrease,
+                             freq_smooth, time_smooth)
+        cleaned[start:end] = result[0, start - low:end - low]
+    return cleaned
+
+
+def reduce_noise(sound_data, profile, prop_decrease=1.0, block_seconds=30, workers=None,
+                 freq_smooth=2, time_smooth=4):
+    """
+    Reduce broadband noise with STFT-domain spectral gating.
+
+    Channels and time segments aligned to the STFT hop are processed in parallel. Every
+    segment, and every block within a segment, is processed with enough context on both
+    sides that the result is identical to processing the whole signal at once.
+
+    Args:
+        sound_data (np.ndarray): Samples to clean, shape (frames,) or (frames, channels).
+        profile (NoiseProfile): The noise profile to gate against.
+        prop_decrease (float): How much of the noise to remove (from 0 to 1).
+        block_seconds (float): Length of one STFT block in seconds, which bounds the memory used.
+        workers (int): Number of processes to use. Defaults to the number of CPUs.
+        freq_smooth (int): Number of frequency bins over which the gate mask is smoothed.
+        time_smooth (int): Number of frames over which the gate mask is smoothed.
+
+    Returns:
+        np.ndarray: The cleaned samples, with the same shape and dtype as sound_data.
+    """
+    prop_decrease = float(np.clip(prop_decrease, 0, 1))
+    n_fft, hop_length = profile.n_fft, profile.hop_length
+    block_samples = max(int(block_seconds * profile.sample_rate) // hop_length, 1) * hop_length
+
+    cleaned = process_channels(_gate_channel, sound_data, segmentable=True,
+                               overlap=_context_samples(n_fft, hop_length, time_smooth), align=hop_length,
+                               workers=workers, threshold_db=profile.threshold_db, n_fft=n_fft,
+                               hop_length=hop_length, prop_decrease=prop_decrease, freq_smooth=freq_smooth,
+                               time_smooth=time_smooth, block_samples=block_samples)
+
+    if np.issubdtype(sound_data.dtype, np.integer):
+        info = np.iinfo(sound_data.dtype)
+        cleaned = np.clip(np.round(cleaned), info.min, info.max)
+    return cleaned.astype(sound_data.dtype)
+
+
+def reduce_noise_file(input_path, output_path, profile_path=DEFAULT_PROFILE_PATH, prop_decrease=1.0,
+                      workers=None):
+    """
+    Reduce noise in a WAV file using a saved profile, for batch jobs on the same recording setup.
+
+    Args:
+        input_path (str): The WAV file to clean.
+        output_path (str): Where the cleaned WAV file will be written.
+        profile_path (str): The saved noise profile.
+        prop_decrease (float): How much of the noise to remove (from 0 to 1).
+        workers (int): Number of processes to use.
+    """
+    profile = NoiseProfile.load(profile_path)
+    if profile is None:
+        raise FileNotFoundError("No noise profile found at {}.".format(profile_path))
+
+    sample_rate, sound_data = wavfile.read(input_path)
+    if sample_rate != profile.sample_rate:
+        raise ValueError("The noise profile was learned at {} Hz but {} is {} Hz.".format(
+            profile.sample_rate, input_path, sample_rate))
+
+    wavfile.write(output_path, sample_rate, reduce_noise(sound_data, profile, prop_decrease, workers=workers))
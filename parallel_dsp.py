@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Buffers smaller than this (in samples over all channels) are processed in this process,
+# where starting the work is cheaper than handing it to the pool
+MIN_PARALLEL_SAMPLES = 1 << 18
+
+_executor = None
+_executor_workers = 0
+
+
+def _get_executor(workers):
+    """
+    Return a process pool with the given number of workers, reusing the previous one if possible.
+
+    Workers are started from a clean forkserver (or spawned where that is unavailable), because
+    forking a process that runs Qt and SDL audio threads can deadlock the child.
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        shutdown_pool()
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+        _executor_workers = workers
+    return _executor
+
+
+def shutdown_pool():
+    """
+    Shut down the worker pool, if one was started.
+    """
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+        _executor_workers = 0
+
+
+def _split(total_samples, segments, overlap, align):
+    """
+    Split [0, total_samples) into segments aligned to align samples.
+
+    Returns a list of (low, high, start, end) tuples: [start, end) is the part the segment
+    is responsible for and [low, high) is that part extended by overlap samples of context.
+    """
+    length = -(-total_samples // segments)
+    length = max(-(-length // align) * align, align)
+    return [(max(start - overlap, 0), min(start + length + overlap, total_samples),
+             start, min(start + length, total_samples))
+            for start in range(0, total_samples, length)]
+
+
+def _run_task(kernel, in_name, in_shape, in_dtype, out_name, out_shape, channel, low, high, start, end, params):
+    """
+    Run a kernel on one channel segment of a shared input buffer and write into a shared output buffer.
+    """
+    in_memory = shared_memory.SharedMemory(name=in_name)
+    out_memory = shared_memory.SharedMemory(name=out_name)
+    try:
+        in_data = np.ndarray(in_shape, dtype=in_dtype, buffer=in_memory.buf)
+        out_data = np.ndarray(out_shape, dtype=np.float64, buffer=out_memory.buf)
+        result = kernel(in_data[low:high, channel].astype(np.float64), low, **params)
+        out_data[start:end, channel] = result[start - low:end - low]
+        # Drop the views before closing, the buffers cannot be released while they are exported
+        del in_data, out_data
+    finally:
+        in_memory.close()
+        out_memory.close()
+
+
+def process_channels(kernel, sound_data, out_samples=None, segmentable=False, overlap=0, align=1,
+                     workers=None, **params):
+    """
+    Apply a DSP kernel to every channel of the sound data, in parallel across a process pool.
+
+    Work is split by channel, and by time segment when the kernel allows it. The input and
+    output live in shared memory, so workers read and write the audio in place instead of
+    receiving pickled copies.
+
+    The kernel is called as kernel(x, start_index, **params), where x is a 1-D float64 slice
+    of one channel starting at sample start_index. It must be a module-level function so the
+    workers can import it.
+
+    Args:
+        kernel (callable): The function applied to every channel or channel segment.
+        sound_data (np.ndarray): Samples, shape (frames,) or (frames, channels).
+        out_samples (int): Length of the output per channel, if the kernel changes it. Such kernels
+            are never split in time.
+        segmentable (bool): Whether the kernel may be run on time segments of a channel.
+        overlap (int): Samples of context the kernel needs on each side of a segment.
+        align (int): Segment boundaries are placed on multiples of this many samples.
+        workers (int): Number of processes. Defaults to the number of CPUs.
+        **params: Extra keyword arguments passed to the kernel.
+
+    Returns:
+        np.ndarray: The float64 result, shape (out_samples,) or (out_samples, channels).
+    """
+    mono = sound_data.ndim == 1
+    if mono:
+        sound_data = sound_data[:, np.newaxis]
+    total_samples, channels = sound_data.shape
+    if out_samples is None:
+        out_samples = total_samples
+    else:
+        segmentable = False
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or sound_data.size < MIN_PARALLEL_SAMPLES or total_samples == 0:
+        out_data = np.empty((out_samples, channels), dtype=np.float64)
+        for channel in range(channels):
+            out_data[:, channel] = kernel(sound_data[:, channel].astype(np.float64), 0, **params)
+        return out_data[:, 0] if mono else out_data
+
+    # Use enough time segments per channel to keep every worker busy
+    segments = -(-workers // channels) if segmentable else 1
+    spans = _split(total_samples, segments, overlap, align) if segmentable else \
+        [(0, total_samples, 0, out_samples)]
+
+    in_memory = shared_memory.SharedMemory(create=True, size=max(sound_data.nbytes, 1))
+    out_memory = shared_memory.SharedMemory(create=True, size=max(out_samples * channels * 8, 1))
+    try:
+        in_data = np.ndarray(sound_data.shape, dtype=sound_data.dtype, buffer=in_memory.buf)
+        in_data[:] = sound_data
+        out_data = np.ndarray((out_samples, channels), dtype=np.float64, buffer=out_memory.buf)
+
+        executor = _get_executor(workers)
+        futures = [executor.submit(_run_task, kernel, in_memory.name, sound_data.shape, sound_data.dtype,
+                                   out_memory.name, out_data.shape, channel, low, high, start, end, params)
+                   for channel in range(channels) for low, high, start, end in spans]
+        for future in futures:
+            future.result()
+
+        result = out_data.copy()
+        del in_data, out_data
+    finally:
+        in_memory.close()
+        in_memory.unlink()
+        out_memory.close()
+        out_memory.unlink()
+
+    return result[:, 0] if mono else result
@@ -0,0 +1,374 @@
+import time as tm
+from collections import namedtuple
+
+import numpy as np
+import pygame
+import scipy.signal as signal
+from scipy.io import wavfile
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# One block of samples pulled by the audio sink, and the clock time at which it was pulled
+QueuedBlock = namedtuple("QueuedBlock", ["time", "sound", "start", "samples"])
+
+# Playback actions (play, pause, unpause, stop) in the order they happened
+PlaybackEvent = namedtuple("PlaybackEvent", ["time", "action"])
+
+
+def to_mixer_format(sound_data, sample_rate, frequency, channels):
+    """
+    Convert PCM samples to the mixer's sample rate, channel count and 16-bit format.
+
+    Samples that already match the mixer are returned without a copy.
+
+    Args:
+        sound_data (np.ndarray): Samples, shape (frames,) or (frames, channels).
+        sample_rate (int): Sample rate of sound_data.
+        frequency (int): Sample rate of the mixer.
+        channels (int): Number of channels of the mixer.
+
+    Returns:
+        np.ndarray: Contiguous int16 samples of shape (frames, channels).
+    """
+    if sound_data.ndim == 1:
+        sound_data = sound_data[:, np.newaxis]
+
+    if sound_data.dtype == np.uint8:
+        sound_data = (sound_data.astype(np.int16) - 128) << 8
+    elif sound_data.dtype == np.int32:
+        sound_data = sound_data >> 16
+    elif np.issubdtype(sound_data.dtype, np.floating):
+        sound_data = np.clip(sound_data, -1, 1) * np.iinfo(np.int16).max
+
+    if sample_rate != frequency:
+        sound_data = signal.resample_poly(sound_data, frequency, sample_rate, axis=0)
+
+    # Resampling overshoots near full scale, clip so those samples do not wrap around
+    if sound_data.dtype != np.int16:
+        sound_data = np.clip(sound_data, np.iinfo(np.int16).min, np.iinfo(np.int16).max)
+
+    # Duplicate mono to all channels, or keep the first channels of a wider file
+    if sound_data.shape[1] != channels:
+        sound_data = np.resize(sound_data.T, (max(channels, sound_data.shape[1]), sound_data.shape[0])).T
+        sound_data = sound_data[:, :channels]
+
+    return np.ascontiguousarray(sound_data, dtype=np.int16)
+
+
+class PygameBackend:
+    """
+    Audio backend that plays through the pygame mixer and the real sound card.
+    """
+
+    headless = False
+
+    # Channel of the sound started last, for queueing sounds after it
+    channel = None
+
+    def init(self):
+        """
+        Initialize pygame and the mixer.
+        """
+        pygame.init()
+        pygame.mixer.init()
+
+    def clock(self):
+        """
+        Return the current time in seconds.
+        """
+        return tm.time()
+
+    def frequency(self):
+        """
+        Return the sample rate of the mixer.
+        """
+        return pygame.mixer.get_init()[0]
+
+    def channels(self):
+        """
+        Return the number of channels of the mixer.
+        """
+        return pygame.mixer.get_init()[2]
+
+    def load(self, path):
+        """
+        Load an audio file into a sound.
+        """
+        return pygame.mixer.Sound(path)
+
+    def from_pcm(self, sound_data, sample_rate):
+        """
+        Create a sound from decoded PCM samples of any sample rate and channel count.
+        """
+        frequency, _, channels = pygame.mixer.get_init()
+        return self.make_sound(to_mixer_format(sound_data, sample_rate, frequency, channels))
+
+    def make_sound(self, sound_data):
+        """
+        Create a sound from a contiguous (frames, channels) int16 array.
+        """
+        return pygame.sndarray.make_sound(sound_data)
+
+    def samples(self, sound):
+        """
+        Return the samples of a sound as an array referencing the sound's buffer.
+        """
+        return pygame.sndarray.samples(sound)
+
+    def get_length(self, sound):
+        """
+        Return the length of a sound in seconds.
+        """
+        return sound.get_length()
+
+    def pump(self):
+        """
+        Nothing to do, the pygame mixer pulls audio on its own thread.
+        """
+
+    def play(self, sound):
+        self.channel = sound.play()
+
+    def queue(self, sound):
+        """
+        Play a sound on the current channel as soon as the sound playing there ends.
+        """
+        self.channel.queue(sound)
+
+    def queue_free(self):
+        """
+        Return whether another sound can be queued without replacing a queued one.
+        """
+        return self.channel is not None and self.channel.get_queue() is None
+
+    def pause(self):
+        pygame.mixer.pause()
+
+    def unpause(self):
+        pygame.mixer.unpause()
+
+    def stop(self):
+        pygame.mixer.stop()
+
+
+class ManualClock:
+    """
+    Deterministic clock for headless runs. Time only moves when advance() is called.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        """
+        Move the clock forward by the given number of seconds.
+        """
+        self.now += seconds
+
+
+class NullSound:
+    """
+    Sound of the null backend: an int16 (frames, channels) array and its sample rate.
+    """
+
+    def __init__(self, sound_data, frequency):
+        self.array = sound_data
+        self.frequency = frequency
+
+
+class NullBackend:
+    """
+    Audio backend without a sound card, so playback can be asserted and benchmarked on a
+    headless machine.
+
+    It simulates a device that pulls one block of buffer_size frames per buffer period, on a
+    fixed grid of ticks starting when the backend is created. pump() pulls every block that is
+    due by the current clock time and records exactly which samples were pulled and when.
+    Pausing delays the remaining blocks and stopping drops them.
+    """
+
+    headless = True
+
+    def __init__(self, frequency=44100, channels=2, buffer_size=4096, clock=None):
+        """
+        Args:
+            frequency (int): Sample rate of the simulated mixer.
+            channels (int): Number of channels of the simulated mixer.
+            buffer_size (int): Number of frames in one block.
+            clock (callable): Returns the current time in seconds. Defaults to a ManualClock.
+                Pass time.perf_counter to include the time spent computing effects in benchmarks.
+        """
+        self.mixer_frequency = frequency
+        self.mixer_channels = channels
+        self.buffer_size = buffer_size
+        self.clock = clock if clock is not None else ManualClock()
+        self.queued_blocks = []
+        self.events = []
+
+        # Tick grid of the simulated device
+        self.device_start = self.clock()
+        self.period = buffer_size / frequency
+        self.tick = 0
+
+        # Sound being played, the next frame to pull from it, the sound queued after it,
+        # and whether playback is paused
+        self.current = None
+        self.position = 0
+        self.next_sound = None
+        self.paused = False
+
+    def init(self):
+        pass
+
+    def frequency(self):
+        return self.mixer_frequency
+
+    def channels(self):
+        return self.mixer_channels
+
+    def load(self, path):
+        """
+        Load a WAV file and convert it to the mixer format, as the pygame mixer does.
+        """
+        sample_rate, sound_data = wavfile.read(path)
+        return self.from_pcm(sound_data, sample_rate)
+
+    def from_pcm(self, sound_data, sample_rate):
+        return NullSound(to_mixer_format(sound_data, sample_rate, self.mixer_frequency, self.mixer_channels),
+                         self.mixer_frequency)
+
+    def make_sound(self, sound_data):
+        return NullSound(np.array(sound_data, dtype=np.int16), self.mixer_frequency)
+
+    def samples(self, sound):
+        return sound.array
+
+    def get_length(self, sound):
+        return sound.array.shape[0] / sound.frequency
+
+    def pump(self, include_now=True):
+        """
+        Pull every block that is due by the current clock time.
+
+        Args:
+            include_now (bool): Also pull the block of a tick at exactly the current time. Playback
+                actions first pump without it, so that an action at time t applies to the tick at t.
+        """
+        now = self.clock()
+        while True:
+            tick_time = self.device_start + self.tick * self.period
+            if tick_time > now or (tick_time == now and not include_now):
+                break
+            if self.current is not None and not self.paused:
+                block = self.current.array[self.position:self.position + self.buffer_size]
+                self.queued_blocks.append(QueuedBlock(tick_time, self.current, self.position, block))
+                self.position += len(block)
+                if self.position >= self.current.array.shape[0]:
+                    self.current, self.next_sound = self.next_sound, None
+                    self.position = 0
+            self.tick += 1
+
+    def play(self, sound):
+        """
+        Start playing a sound. Its first block is pulled on the next tick of the device.
+        """
+        self.pump(include_now=False)
+        self.events.append(PlaybackEvent(self.clock(), "play"))
+        self.current = sound
+        self.position = 0
+        self.next_sound = None
+        self.paused = False
+        self.pump()
+
+    def queue(self, sound):
+        """
+        Queue a sound to be pulled right after the current one, or start it if nothing is playing.
+        """
+        self.pump(include_now=False)
+        if self.current is None:
+            self.current = sound
+            self.position = 0
+        else:
+            self.next_sound = sound
+        self.pump()
+
+    def queue_free(self):
+        return self.next_sound is None
+
+    def pause(self):
+        self.pump(include_now=False)
+        self.events.append(PlaybackEvent(self.clock(), "pause"))
+        self.paused = True
+
+    def unpause(self):
+        self.pump(include_now=False)
+        self.events.append(PlaybackEvent(self.clock(), "unpause"))
+        self.paused = False
+        self.pump()
+
+    def stop(self):
+        self.pump(include_now=False)
+        self.events.append(PlaybackEvent(self.clock(), "stop"))
+        self.current = None
+        self.next_sound = None
+
+    def rendered(self):
+        """
+        Return all samples pulled so far in order, as one (frames, channels) array.
+        """
+        self.pump()
+        if not self.queued_blocks:
+            return np.zeros((0, self.mixer_channels), dtype=np.int16)
+        return np.concatenate([block.samples for block in self.queued_blocks])
+
+    def write(self, path):
+        """
+        Write all samples pulled so far to a WAV file, which makes this backend a file audio sink.
+        """
+        wavfile.write(path, self.mixer_frequency, self.rendered())
+
+    def start_latency(self, requested_at):
+        """
+        Return the time between a playback request and the first block pulled after it, in seconds.
+
+        With the default ManualClock this is the wait for the next device tick. With a real clock
+        it also includes the time spent preparing the sound, such as computing an effect.
+
+        Args:
+            requested_at (float): Clock time at which playback was requested.
+        """
+        self.pump()
+        for block in self.queued_blocks:
+            if block.time >= requested_at:
+                return block.time - requested_at
+        return None
+
+
+class OffscreenCanvas(FigureCanvasAgg):
+    """
+    Matplotlib canvas that renders into memory instead of a Qt widget and records the
+    playback cursor position of every draw.
+    """
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.visible = False
+        self.cursor_positions = []
+
+    def setParent(self, parent):
+        pass
+
+    def setVisible(self, visible):
+        self.visible = visible
+
+    def isVisible(self):
+        return self.visible
+
+    def draw(self):
+        super().draw()
+        for ax in self.figure.axes:
+            for line in ax.get_lines():
+                if line.get_label() == "Current Time":
+                    self.cursor_positions.append(float(line.get_xdata()[0]))
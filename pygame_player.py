@@ -1,13 +1,18 @@
 import sys
-import time as tm
 
 import numpy as np
 import wave
-import pygame
 import scipy.signal as signal
 from scipy.io.wavfile import write
 import librosa.display
 
+from audio_cache import DecodedAudioCache
+from audio_index import AudioIndex
+from effects import resample_kernel, filtfilt_kernel
+from noise_reduction import NoiseProfile, learn_noise_profile, reduce_noise
+from parallel_dsp import process_channels, shutdown_pool
+from playback_backend import PygameBackend, OffscreenCanvas
+
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
@@ -17,6 +22,9 @@ from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QFileDialog, QAction, \
     QMessageBox, QLabel, QLineEdit, QGridLayout, QHBoxLayout, QDialog
 
+# Length of the windows streamed after a seek
+SEEK_WINDOW_SECONDS = 10
+
 
 def show_message(title, message):
     """
@@ -37,10 +45,17 @@ class SoundPlayer(QMainWindow):
     A simple sound player application with a graphical user interface.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: The audio backend. Defaults to PygameBackend. A headless backend such as
+                NullBackend also replaces the plot widget with an offscreen canvas and message
+                boxes with printed messages, so the player runs without a display or sound card.
+        """
         super().__init__()
 
-        # Initialize the pygame library
+        self.backend = backend if backend is not None else PygameBackend()
+        self.messages = []
 
         self.sound = None
         self.timer = None
@@ -48,13 +63,23 @@ class SoundPlayer(QMainWindow):
         self.canvas = None
         self.figure = None
         self.trim_window = None
-        pygame.init()
+        self.audio_index = None
+        self.indexed_sound = None
+        self.loaded_sound = None
+        self.stream_position = None
 
         # Path to the sound file (initially empty)
         self.audio_file_path = None
 
-        # Initialize the sound player
-        pygame.mixer.init()
+        # Cache of decoded non-WAV files (created on first use) and the decoded samples of the current file
+        self.audio_cache = None
+        self.decoded_audio = None
+
+        # Noise profile saved by a previous session, reused without re-analysis
+        self.noise_profile = NoiseProfile.load()
+
+        # Initialize the audio backend
+        self.backend.init()
 
         # Initialize the graphical user interface
         self.init_ui()
@@ -89,7 +114,10 @@ class SoundPlayer(QMainWindow):
 
         # Create and configure the plot (added outside the view)
         self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        if self.backend.headless:
+            self.canvas = OffscreenCanvas(self.figure)
+        else:
+            self.canvas = FigureCanvas(self.figure)
         self.ax = self.figure.add_subplot(111)
         self.canvas.setParent(self)
         self.canvas.setVisible(False)
@@ -99,6 +127,8 @@ class SoundPlayer(QMainWindow):
         self.toggle_button = QPushButton("Pause/Resume")
         self.stop_button = QPushButton("Stop")
         self.reverse_button = QPushButton("Play in Reverse")
+        self.next_event_button = QPushButton("Jump to next event")
+        self.trim_suggestion_button = QPushButton("Suggest trim of leading and trailing silence")
         # self.plot_spectrogram_button = QPushButton("Create spectogram plot")
         # self.show_spectrogram_button = QPushButton("Show spectogram plot")
         self.plot_and_show_spectrogram_button = QPushButton("Create and show spectogram plot")
@@ -121,6 +151,18 @@ class SoundPlayer(QMainWindow):
         self.noise_submit_button = QPushButton("Submit noise cutoff strength. Play with noise filter")
         self.noise_submit_button.clicked.connect(lambda: self.noise_filter(self.noise_input.text()))
 
+        self.noise_profile_label = QLabel("Noise-only region for the noise profile (start and end in seconds, e.g. 0,1.5):")
+        self.noise_profile_input = QLineEdit()
+        self.noise_profile_submit_button = QPushButton("Submit noise region and learn noise profile")
+        self.noise_profile_submit_button.clicked.connect(
+            lambda: self.learn_noise_profile(self.noise_profile_input.text()))
+
+        self.noise_reduction_label = QLabel("Noise reduction strength (from 0 to 1, 1 removes all of the learned noise):")
+        self.noise_reduction_input = QLineEdit()
+        self.noise_reduction_submit_button = QPushButton("Submit noise reduction strength. Play with noise reduction")
+        self.noise_reduction_submit_button.clicked.connect(
+            lambda: self.noise_reduction(self.noise_reduction_input.text()))
+
         self.fade_in_label = QLabel("Fade in time")
         self.fade_in_input = QLineEdit()
         self.fade_in_submit_button = QPushButton("Submit fade in time")
@@ -133,11 +175,14 @@ class SoundPlayer(QMainWindow):
 
         # Add buttons to the layout
         layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
+        if not self.backend.headless:
+            layout.addWidget(self.canvas)
         layout.addWidget(self.play_button)
         layout.addWidget(self.toggle_button)
         layout.addWidget(self.stop_button)
         layout.addWidget(self.reverse_button)
+        layout.addWidget(self.next_event_button)
+        layout.addWidget(self.trim_suggestion_button)
 
         # Add tempo label, input and tempo submit button to the layout
         layout.addWidget(self.tempo_label)
@@ -154,6 +199,14 @@ class SoundPlayer(QMainWindow):
         layout.addWidget(self.noise_input)
         layout.addWidget(self.noise_submit_button)
 
+        # Add noise profile and noise reduction inputs and buttons to the layout
+        layout.addWidget(self.noise_profile_label)
+        layout.addWidget(self.noise_profile_input)
+        layout.addWidget(self.noise_profile_submit_button)
+        layout.addWidget(self.noise_reduction_label)
+        layout.addWidget(self.noise_reduction_input)
+        layout.addWidget(self.noise_reduction_submit_button)
+
         layout.addWidget(self.fade_in_label)
         layout.addWidget(self.fade_in_input)
         layout.addWidget(self.fade_in_submit_button)
@@ -174,23 +227,31 @@ class SoundPlayer(QMainWindow):
         self.toggle_button.clicked.connect(self.toggle_play_sound)
         self.stop_button.clicked.connect(self.stop_sound)
         self.reverse_button.clicked.connect(self.play_reverse_sound)
+        self.next_event_button.clicked.connect(self.jump_to_next_event)
+        self.trim_suggestion_button.clicked.connect(self.show_trim_suggestion)
         self.plot_and_show_spectrogram_button.clicked.connect(lambda: self.plot_and_show_spectrogram("spectrogram.png"))
         self.save_audio_file_button.clicked.connect(lambda: self.save_audio_file("output.wav"))
 
         # Initialize a timer to update the plot
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_plot)
-        self.timer.start(100)  # Update the plot every 100 ms
+        # Headless runs call update_plot themselves so that every frame is deterministic
+        if not self.backend.headless:
+            self.timer.start(100)  # Update the plot every 100 ms
 
         # Disable playback, pause, and stop buttons initially
         self.play_button.setEnabled(False)
         self.toggle_button.setEnabled(False)
         self.stop_button.setEnabled(False)
         self.reverse_button.setEnabled(False)
+        self.next_event_button.setEnabled(False)
+        self.trim_suggestion_button.setEnabled(False)
 
         self.volume_submit_button.setEnabled(False)
         self.tempo_submit_button.setEnabled(False)
         self.noise_submit_button.setEnabled(False)
+        self.noise_profile_submit_button.setEnabled(False)
+        self.noise_reduction_submit_button.setEnabled(False)
 
         self.fade_in_submit_button.setEnabled(False)
         self.fade_out_submit_button.setEnabled(False)
@@ -203,8 +264,18 @@ class SoundPlayer(QMainWindow):
         """
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getOpenFileName(self, "Open Audio File", "",
-                                                   "Audio Files (*.wav);;All Files (*)", options=options)
+                                                   "Audio Files (*.wav *.flac *.mp3 *.ogg);;All Files (*)", options=options)
 
+        if file_name:
+            self.open_audio_path(file_name)
+
+    def open_audio_path(self, file_name):
+        """
+        Open the given audio file for playback and enable the controls.
+
+        Args:
+            file_name (str): The path of the audio file.
+        """
         if file_name:
             self.audio_file_path = file_name
             self.output_file_path = "output.wav"
@@ -213,6 +284,8 @@ class SoundPlayer(QMainWindow):
             self.toggle_button.setEnabled(True)
             self.stop_button.setEnabled(True)
             self.reverse_button.setEnabled(True)
+            self.next_event_button.setEnabled(True)
+            self.trim_suggestion_button.setEnabled(True)
             self.fade_in_submit_button.setEnabled(True)
             self.fade_out_submit_button.setEnabled(True)
             self.plot_and_show_spectrogram_button.setEnabled(True)
@@ -221,27 +294,86 @@ class SoundPlayer(QMainWindow):
             self.volume_submit_button.setEnabled(True)
             self.tempo_submit_button.setEnabled(True)
             self.noise_submit_button.setEnabled(True)
+            self.noise_profile_submit_button.setEnabled(True)
+            self.noise_reduction_submit_button.setEnabled(True)
 
     def load_audio_file(self):
         """
         Load the selected audio file and reset playback variables.
         """
-        pygame.mixer.init()
-        self.sound = pygame.mixer.Sound(self.audio_file_path)
+        self.backend.init()
+        if self.audio_file_path.lower().endswith(".wav"):
+            self.decoded_audio = None
+            self.sample_rate = wave.open(self.audio_file_path).getframerate()
+            self.channel_count = wave.open(self.audio_file_path).getnchannels()
+        else:
+            # Other formats are decoded once, in the mixer format, and then memory-mapped from the cache
+            if self.audio_cache is None:
+                self.audio_cache = DecodedAudioCache()
+            self.decoded_audio = self.audio_cache.open(self.audio_file_path, self.backend.frequency(),
+                                                       self.backend.channels())
+            self.sample_rate = self.decoded_audio[0]
+            self.channel_count = self.decoded_audio[1].shape[1]
+        self.sound = self.load_sound()
+        self.loaded_sound = self.sound
         self.start_time = 0
         self.is_playing = False
         self.paused = False
         self.paused_time = 0
         self.paused_position = 0
-        self.sample_rate = wave.open(self.audio_file_path).getframerate()
-        self.channel_count = wave.open(self.audio_file_path).getnchannels()
+        self.build_audio_index()
+
+    def load_sound(self):
+        """
+        Create a sound from the loaded audio file, without any effects applied.
+        """
+        if self.decoded_audio is not None:
+            sample_rate, sound_data = self.decoded_audio
+            return self.backend.from_pcm(sound_data, sample_rate)
+        return self.backend.load(self.audio_file_path)
+
+    def build_audio_index(self):
+        """
+        Build the silence/onset index of the current sound in one pass over its samples.
+        """
+        self.audio_index = AudioIndex.build(self.backend.samples(self.sound), self.backend.frequency())
+        self.indexed_sound = self.sound
+
+    def current_audio_index(self):
+        """
+        Return the index of the current sound, rebuilding it if an effect has replaced the sound.
+        """
+        if self.audio_index is None or self.indexed_sound is not self.sound:
+            self.build_audio_index()
+        return self.audio_index
+
+    def show_message(self, title, message):
+        """
+        Show a message box, or record and print the message when running headless.
+
+        Args:
+            title (str): The title of the message box.
+            message (str): The message to display in the box.
+        """
+        if self.backend.headless:
+            self.messages.append((title, message))
+            print("{}: {}".format(title, message))
+        else:
+            show_message(title, message)
+
+    def closeEvent(self, event):
+        """
+        Shut down the DSP worker pool when the window is closed.
+        """
+        shutdown_pool()
+        super().closeEvent(event)
 
     def toggle_play_sound(self):
         """
         Toggle between pause and resume playback if the sound is playing.
         """
         if not self.is_playing:
-            show_message("Error", "You can't pause if the sound is not playing.")
+            self.show_message("Error", "You can't pause if the sound is not playing.")
         else:
             self.toggle()
 
@@ -255,16 +387,15 @@ class SoundPlayer(QMainWindow):
 
             print("Starting playback")
 
-            length_seconds = pygame.mixer.Sound(self.audio_file_path).get_length()
-
             if self.paused:
                 print("Resuming")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
                 print("Playing from the beginning")
-                self.sound = pygame.mixer.Sound(self.audio_file_path)
-                self.sound.play()
-                self.start_time = tm.time()
+                # Reuse the loaded sound, so the file is not read again and its index stays valid
+                self.sound = self.loaded_sound
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
             self.is_playing = True
             self.paused = False
 
@@ -274,15 +405,15 @@ class SoundPlayer(QMainWindow):
         """
         if self.paused:
             print("Resuming")
-            pygame.mixer.unpause()
-            current_time = tm.time()
+            self.backend.unpause()
+            current_time = self.backend.clock()
             elapsed_pause_time = current_time - self.paused_time
             self.start_time += elapsed_pause_time
         else:
             print("Pausing")
-            pygame.mixer.pause()
-            self.paused_time = tm.time()
-            self.paused_position = pygame.mixer.music.get_pos() / 1000
+            self.backend.pause()
+            self.paused_time = self.backend.clock()
+            self.paused_position = self.paused_time - self.start_time
         self.paused = not self.paused
 
     def stop_sound(self):
@@ -291,19 +422,94 @@ class SoundPlayer(QMainWindow):
         """
 
         print("Stopping playback")
-        pygame.mixer.stop()
+        self.backend.stop()
+        self.stream_position = None
         self.is_playing = False
         self.start_time = 0
         self.paused = False
         self.paused_time = 0
 
+    def seek(self, position_seconds):
+        """
+        Start playback of the current sound from the given position.
+
+        The rest of the sound is streamed in windows of SEEK_WINDOW_SECONDS, so a jump only
+        copies one window no matter how long the recording is.
+
+        Args:
+            position_seconds (float): The position to start playing from, in seconds.
+        """
+        self.backend.stop()
+        self.stream_position = int(position_seconds * self.backend.frequency())
+        self.stream_next_window(start=True)
+
+        # Shift the start time so the cursor in the plot shows the new position
+        self.start_time = self.backend.clock() - position_seconds
+        self.is_playing = True
+        self.paused = False
+
+    def stream_next_window(self, start=False):
+        """
+        Play or queue the next window of the current sound after a seek.
+
+        Args:
+            start (bool): Start playback with this window instead of queueing it after the current one.
+        """
+        sound_data = self.backend.samples(self.sound)
+        end_index = min(self.stream_position + int(SEEK_WINDOW_SECONDS * self.backend.frequency()),
+                        sound_data.shape[0])
+        window = self.backend.make_sound(np.ascontiguousarray(sound_data[self.stream_position:end_index]))
+        if start:
+            self.backend.play(window)
+        else:
+            self.backend.queue(window)
+        self.stream_position = end_index if end_index < sound_data.shape[0] else None
+
+    def current_position(self):
+        """
+        Return the current playback position in seconds.
+        """
+        if not self.is_playing:
+            return 0.0
+        if self.paused:
+            return self.paused_time - self.start_time
+        return self.backend.clock() - self.start_time
+
+    def jump_to_next_event(self):
+        """
+        Jump playback to the next onset or the next end of silence.
+        """
+        next_event = self.current_audio_index().next_event(self.current_position())
+        if next_event is None:
+            self.show_message("Info", "There are no more events after the current position.")
+            return
+
+        self.canvas.setVisible(True)
+        print("Jumping to {:.2f} s".format(next_event))
+        self.seek(next_event)
+
+    def show_trim_suggestion(self):
+        """
+        Show start and end times that would trim leading and trailing silence.
+        """
+        audio_index = self.current_audio_index()
+        start_seconds, end_seconds = audio_index.trim_suggestion()
+        self.show_message("Trim suggestion", "Suggested trim: from {:.2f} s to {:.2f} s (of {:.2f} s).".format(
+            start_seconds, end_seconds, audio_index.duration))
+
     def update_plot(self):
         """
         Update the audio waveform plot and check for the end of playback.
         """
+        self.backend.pump()
+
+        # Keep one window queued ahead while streaming after a seek
+        if self.stream_position is not None and self.is_playing and not self.paused and self.backend.queue_free():
+            self.stream_next_window()
+
         if self.is_playing and not self.paused:
-            y, sr = pygame.sndarray.samples(self.sound), pygame.mixer.get_init()[0]
-            current_time = tm.time() - self.start_time
+            y, sr = self.backend.samples(self.sound), self.backend.frequency()
+            current_time = self.backend.clock() - self.start_time
             sound_duration = len(y) / sr
             current_time = min(current_time, sound_duration)
             time = np.linspace(0, len(y) / sr, num=len(y))
@@ -330,17 +536,17 @@ class SoundPlayer(QMainWindow):
             print("Starting reverse playback")
             if self.paused:
                 print("Resuming reverse playback")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
 
                 print("Playing in reverse from the end")
-                sound_data = pygame.sndarray.samples(self.sound)
+                sound_data = self.backend.samples(self.sound)
                 reversed_data = np.flip(sound_data)
                 reversed_data_contiguous = np.ascontiguousarray(reversed_data)
-                reversed_sound = pygame.sndarray.make_sound(reversed_data_contiguous)
+                reversed_sound = self.backend.make_sound(reversed_data_contiguous)
                 self.sound = reversed_sound
-                self.sound.play()
-                self.start_time = tm.time()
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
 
             self.is_playing = True
             self.paused = False
@@ -352,7 +558,7 @@ class SoundPlayer(QMainWindow):
         try:
             volume_factor = float(volume_factor)
         except ValueError:
-            show_message("Error", "Please enter a valid number for the volume factor.")
+            self.show_message("Error", "Please enter a valid number for the volume factor.")
             return
 
         self.canvas.setVisible(True)
@@ -361,19 +567,19 @@ class SoundPlayer(QMainWindow):
             print("Starting playback with changed volume")
             if self.paused:
                 print("Resuming playback with changed volume")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
 
                 print("Playing with changed volume ")
-                sound_data = pygame.sndarray.samples(self.sound)
+                sound_data = self.backend.samples(self.sound)
                 volumed_data = np.multiply(sound_data, volume_factor)
                 volumed_data = volumed_data.astype(np.int16)
 
                 volumed_data_contiguous = np.ascontiguousarray(volumed_data)
-                volumed_sound = pygame.sndarray.make_sound(volumed_data_contiguous)
+                volumed_sound = self.backend.make_sound(volumed_data_contiguous)
                 self.sound = volumed_sound
-                self.sound.play()
-                self.start_time = tm.time()
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
 
             self.is_playing = True
             self.paused = False
@@ -385,7 +591,7 @@ class SoundPlayer(QMainWindow):
         try:
             tempo_factor = float(tempo_factor)
         except ValueError:
-            show_message("Error", "Please enter a valid number for the speed factor.")
+            self.show_message("Error", "Please enter a valid number for the speed factor.")
             return
 
         self.canvas.setVisible(True)
@@ -394,24 +600,26 @@ class SoundPlayer(QMainWindow):
             print("Starting playback with changed tempo")
             if self.paused:
                 print("Resuming playback with changed tempo")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
 
                 print("Playing slower with changed tempo")
 
-                sound_data = pygame.sndarray.samples(self.sound)
+                sound_data = self.backend.samples(self.sound)
 
-                changed_tempo_data = signal.resample(sound_data, int(sound_data.shape[0] * 1 / tempo_factor), axis=0)
+                out_samples = int(sound_data.shape[0] * 1 / tempo_factor)
+                changed_tempo_data = process_channels(resample_kernel, sound_data, out_samples=out_samples,
+                                                      num=out_samples)
 
                 # cast slower_data to int16
                 changed_tempo_data = changed_tempo_data.astype(np.int16)
 
                 slower_data_contiguous = np.ascontiguousarray(changed_tempo_data)
-                slower_sound = pygame.sndarray.make_sound(slower_data_contiguous)
+                slower_sound = self.backend.make_sound(slower_data_contiguous)
 
                 self.sound = slower_sound
-                self.sound.play()
-                self.start_time = tm.time()
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
 
             self.is_playing = True
             self.paused = False
@@ -424,7 +632,7 @@ class SoundPlayer(QMainWindow):
             noise_cutoff_frequency = float(noise_cutoff_frequency)
             noise_cutoff_frequency = np.clip(noise_cutoff_frequency, 0, 1)
         except ValueError:
-            show_message("Error", "Please enter a valid number for the noise cutoff strength (from 0 to 1).")
+            self.show_message("Error", "Please enter a valid number for the noise cutoff strength (from 0 to 1).")
             return
 
         self.canvas.setVisible(True)
@@ -433,27 +641,98 @@ class SoundPlayer(QMainWindow):
             print("Starting playback with noise filter")
             if self.paused:
                 print("Resuming playback with noise filter")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
 
                 print("Playing with noise filter")
 
-                sound_data = pygame.sndarray.samples(self.sound)
+                sound_data = self.backend.samples(self.sound)
 
                 # filter the sound data
 
                 b, a = signal.butter(5, noise_cutoff_frequency, 'low', analog=False)
-                filtered_data = signal.filtfilt(b, a, sound_data, axis=0)
+                filtered_data = process_channels(filtfilt_kernel, sound_data, b=b, a=a)
 
                 # cast filtered_data to int16
                 filtered_data = filtered_data.astype(np.int16)
 
                 filtered_data_contiguous = np.ascontiguousarray(filtered_data)
-                filtered_sound = pygame.sndarray.make_sound(filtered_data_contiguous)
+                filtered_sound = self.backend.make_sound(filtered_data_contiguous)
 
                 self.sound = filtered_sound
-                self.sound.play()
-                self.start_time = tm.time()
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
+
+            self.is_playing = True
+            self.paused = False
+
+    def learn_noise_profile(self, noise_region):
+        """
+        Learn a noise profile from a noise-only region of the loaded audio file and save it for later sessions.
+        """
+        try:
+            start_seconds, end_seconds = (float(value) for value in noise_region.split(","))
+        except ValueError:
+            self.show_message("Error", "Please enter the noise region as two numbers: start,end (in seconds).")
+            return
+
+        sound_data = self.backend.samples(self.sound)
+        sample_rate = self.backend.frequency()
+        start_index = max(int(start_seconds * sample_rate), 0)
+        end_index = min(int(end_seconds * sample_rate), sound_data.shape[0])
+
+        try:
+            self.noise_profile = learn_noise_profile(sound_data[start_index:end_index], sample_rate)
+        except ValueError as error:
+            self.show_message("Error", str(error))
+            return
+
+        self.noise_profile.save()
+        print("Noise profile learned and saved")
+
+    def noise_reduction(self, prop_decrease):
+        """
+        Play the loaded audio file with spectral-gating noise reduction using the learned noise profile.
+        """
+        try:
+            prop_decrease = float(prop_decrease)
+            prop_decrease = np.clip(prop_decrease, 0, 1)
+        except ValueError:
+            self.show_message("Error", "Please enter a valid number for the noise reduction strength (from 0 to 1).")
+            return
+
+        if self.noise_profile is None:
+            self.show_message("Error", "Please learn a noise profile from a noise-only region first.")
+            return
+
+        if self.noise_profile.sample_rate != self.backend.frequency():
+            self.show_message("Error", "The saved noise profile was learned at a different sample rate.")
+            return
+
+        self.canvas.setVisible(True)
+        if not self.is_playing:
+
+            print("Starting playback with noise reduction")
+            if self.paused:
+                print("Resuming playback with noise reduction")
+                self.backend.unpause()
+            else:
+
+                print("Playing with noise reduction")
+
+                sound_data = self.backend.samples(self.sound)
+                try:
+                    reduced_data = reduce_noise(sound_data, self.noise_profile, prop_decrease)
+                except ValueError as error:
+                    self.show_message("Error", str(error))
+                    return
+
+                reduced_data_contiguous = np.ascontiguousarray(reduced_data)
+                reduced_sound = self.backend.make_sound(reduced_data_contiguous)
+
+                self.sound = reduced_sound
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
 
             self.is_playing = True
             self.paused = False
@@ -465,23 +744,23 @@ class SoundPlayer(QMainWindow):
         try:
             duration_seconds = float(duration_seconds)
         except ValueError:
-            show_message("Error", "Please enter a valid number for the duration.")
+            self.show_message("Error", "Please enter a valid number for the duration.")
             return
 
         # Check if the user-entered duration is longer than the audio duration
-        audio_duration = self.sound.get_length()
+        audio_duration = self.backend.get_length(self.sound)
 
         if duration_seconds > audio_duration:
-            show_message("Error", "Fade-in duration exceeds audio duration.")
+            self.show_message("Error", "Fade-in duration exceeds audio duration.")
             return
 
         if not self.is_playing:
             print("Starting playback with fade-in effect")
             if self.paused:
                 print("Resuming playback with fade-in effect")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
-                sound_data = pygame.sndarray.samples(self.sound)
+                sound_data = self.backend.samples(self.sound)
                 total_samples = sound_data.shape[0]
 
                 # Calculate the number of samples for the fade-in effect using self.sample_rate
@@ -491,13 +770,15 @@ class SoundPlayer(QMainWindow):
                 # Create a fade-in envelope
                 fade_in_envelope = np.linspace(0, 1, fade_in_samples)
 
-                # Apply the fade-in effect to the audio data
-                sound_data[:fade_in_samples] = sound_data[:fade_in_samples] * fade_in_envelope[:, np.newaxis]
-                volumed_data_contiguous = np.ascontiguousarray(sound_data)
-                volumed_sound = pygame.sndarray.make_sound(volumed_data_contiguous)
+                # Apply the fade-in effect to a copy of the audio data, only the fade region is touched
+                volumed_data = sound_data.copy()
+                volumed_data[:fade_in_samples] = volumed_data[:fade_in_samples] * fade_in_envelope[:, np.newaxis]
+
+                volumed_data_contiguous = np.ascontiguousarray(volumed_data)
+                volumed_sound = self.backend.make_sound(volumed_data_contiguous)
                 self.sound = volumed_sound
-                self.sound.play()
-                self.start_time = tm.time()
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
 
             self.is_playing = True
             self.paused = False
@@ -509,15 +790,15 @@ class SoundPlayer(QMainWindow):
         try:
             duration_seconds = float(duration_seconds)
         except ValueError:
-            show_message("Error", "Please enter a valid number for the duration.")
+            self.show_message("Error", "Please enter a valid number for the duration.")
             return
 
         # Check if the user-entered duration is longer than the audio duration
-        audio_duration = self.sound.get_length()
+        audio_duration = self.backend.get_length(self.sound)
 
         # Check if the user-entered duration is longer than the audio duration
         if duration_seconds > audio_duration:
-            show_message("Error", "Fade-out duration exceeds audio duration.")
+            self.show_message("Error", "Fade-out duration exceeds audio duration.")
             return
 
         self.canvas.setVisible(True)
@@ -526,9 +807,9 @@ class SoundPlayer(QMainWindow):
             print("Starting playback with fade-out effect")
             if self.paused:
                 print("Resuming playback with fade-out effect")
-                pygame.mixer.unpause()
+                self.backend.unpause()
             else:
-                sound_data = pygame.sndarray.samples(self.sound)
+                sound_data = self.backend.samples(self.sound)
                 total_samples = sound_data.shape[0]
 
                 # Calculate the number of samples for the fade-out effect using self.sample_rate
@@ -550,10 +831,10 @@ class SoundPlayer(QMainWindow):
                 volumed_data = volumed_data.astype(np.int16)
 
                 volumed_data_contiguous = np.ascontiguousarray(volumed_data)
-                volumed_sound = pygame.sndarray.make_sound(volumed_data_contiguous)
+                volumed_sound = self.backend.make_sound(volumed_data_contiguous)
                 self.sound = volumed_sound
-                self.sound.play()
-                self.start_time = tm.time()
+                self.backend.play(self.sound)
+                self.start_time = self.backend.clock()
 
             self.is_playing = True
             self.paused = False
@@ -602,8 +883,8 @@ class SoundPlayer(QMainWindow):
         """
         Save the loaded audio file to a WAV file.
         """
-        # Get the raw sound data from the pygame.mixer.Sound object
-        sound_array = pygame.sndarray.array(self.sound)
+        # Get a copy of the raw sound data of the current sound
+        sound_array = np.array(self.backend.samples(self.sound))
         sound_array = sound_array[::2]
 
         # Save the sound data to a WAV file using scipy
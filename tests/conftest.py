@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The application modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Run Qt without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
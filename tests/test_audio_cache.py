@@ -0,0 +1,83 @@
+import os
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("pygame")
+pytest.importorskip("librosa")
+
+import audio_cache
+from audio_cache import DecodedAudioCache
+
+FREQUENCY = 44100
+CHANNELS = 2
+
+
+@pytest.fixture
+def decoded(monkeypatch):
+    # Replace the decoder with one that records the paths it decodes. The samples are filled
+    # with the first byte of the file, so entries of different files can be told apart.
+    paths = []
+
+    def decode_audio(path):
+        paths.append(path)
+        with open(path, "rb") as audio_file:
+            seed = audio_file.read()[0]
+        return FREQUENCY, np.full((FREQUENCY, CHANNELS), seed, dtype=np.int16)
+
+    monkeypatch.setattr(audio_cache, "decode_audio", decode_audio)
+    return paths
+
+
+def write_audio(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_file_is_decoded_once(tmp_path, decoded):
+    path = write_audio(tmp_path / "a.flac", b"\x01 first")
+    cache_dir = str(tmp_path / "cache")
+
+    _, first = DecodedAudioCache(cache_dir).open(path, FREQUENCY, CHANNELS)
+    sample_rate, second = DecodedAudioCache(cache_dir).open(path, FREQUENCY, CHANNELS)
+
+    assert decoded == [path]
+    assert sample_rate == FREQUENCY
+    assert isinstance(second, np.memmap)
+    assert not second.flags.writeable
+    np.testing.assert_array_equal(second, first)
+
+
+def test_copy_reuses_the_entry(tmp_path, decoded):
+    path = write_audio(tmp_path / "a.flac", b"\x01 first")
+    copy_path = str(tmp_path / "copy.flac")
+    shutil.copy(path, copy_path)
+    cache = DecodedAudioCache(str(tmp_path / "cache"))
+
+    cache.open(path, FREQUENCY, CHANNELS)
+    _, samples = cache.open(copy_path, FREQUENCY, CHANNELS)
+
+    assert decoded == [path]
+    assert samples[0, 0] == 1
+    assert len(cache.index["entries"]) == 1
+
+
+def test_eviction_keeps_the_entry_in_use(tmp_path, decoded):
+    first_path = write_audio(tmp_path / "a.flac", b"\x01 first")
+    second_path = write_audio(tmp_path / "b.flac", b"\x02 second")
+    cache = DecodedAudioCache(str(tmp_path / "cache"), max_bytes=1)
+
+    cache.open(first_path, FREQUENCY, CHANNELS)
+    _, samples = cache.open(second_path, FREQUENCY, CHANNELS)
+
+    assert samples[0, 0] == 2
+    assert list(cache.index["paths"]) == [os.path.abspath(second_path)]
+    (key,) = cache.index["entries"]
+    assert key.startswith(cache.index["paths"][os.path.abspath(second_path)]["digest"])
+    assert sorted(os.listdir(str(tmp_path / "cache"))) == sorted([key + ".npy", "index.json"])
+
+    # The evicted file is decoded again when it is opened next
+    cache.open(first_path, FREQUENCY, CHANNELS)
+    assert decoded == [first_path, second_path, first_path]
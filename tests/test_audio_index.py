@@ -0,0 +1,68 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_index import AudioIndex
+
+SAMPLE_RATE = 8000
+
+# 80 blocks per second, so every boundary below falls on a block boundary
+BLOCK_SIZE = 100
+
+
+@pytest.fixture
+def sound_data():
+    # Silence, tone, silence, tone, silence, and a partial block of silence at the end
+    time = np.arange(3 * SAMPLE_RATE + BLOCK_SIZE // 2) / SAMPLE_RATE
+    loud = ((time >= 0.5) & (time < 1.5)) | ((time >= 2.0) & (time < 2.5))
+    tone = 0.5 * np.iinfo(np.int16).max * np.sin(2 * np.pi * 440 * time) * loud
+    return np.column_stack([tone, tone]).astype(np.int16)
+
+
+def build(sound_data, **kwargs):
+    return AudioIndex.build(sound_data, SAMPLE_RATE, block_size=BLOCK_SIZE, **kwargs)
+
+
+def test_silent_spans_and_events(sound_data):
+    index = build(sound_data)
+
+    assert len(index.energy_db) == 241
+    assert index.silent_starts.tolist() == [0, 120, 200]
+    assert index.silent_ends.tolist() == [40, 160, 241]
+    assert index.events.tolist() == [40, 160]
+
+
+def test_next_event(sound_data):
+    index = build(sound_data)
+
+    assert index.next_event(0.0) == 0.5
+    assert index.next_event(0.5) == 2.0
+    assert index.next_event(2.0) is None
+    assert index.next_event(2.9) is None
+
+
+def test_is_silent(sound_data):
+    index = build(sound_data)
+
+    assert index.is_silent(0.25)
+    assert not index.is_silent(1.0)
+    assert index.is_silent(1.75)
+    assert not index.is_silent(2.25)
+    assert index.is_silent(3.0)
+
+
+def test_trim_suggestion(sound_data):
+    assert build(sound_data).trim_suggestion() == (0.5, 2.5)
+    assert build(np.zeros(SAMPLE_RATE, dtype=np.int16)).trim_suggestion() == (0.0, 0.0)
+    assert build(np.zeros(0, dtype=np.int16)).trim_suggestion() == (0.0, 0.0)
+
+
+def test_chunks_match_a_single_pass(sound_data):
+    # 241 blocks do not divide into chunks of 7, so the last chunk is partial as well
+    chunked = build(sound_data, chunk_blocks=7)
+    single = build(sound_data, chunk_blocks=len(sound_data))
+
+    np.testing.assert_array_equal(chunked.energy_db, single.energy_db)
+    np.testing.assert_array_equal(chunked.silent_starts, single.silent_starts)
+    np.testing.assert_array_equal(chunked.silent_ends, single.silent_ends)
+    np.testing.assert_array_equal(chunked.events, single.events)
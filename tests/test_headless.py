@@ -0,0 +1,119 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("PyQt5")
+pytest.importorskip("pygame")
+pytest.importorskip("librosa")
+
+from scipy.io import wavfile
+from PyQt5.QtWidgets import QApplication
+
+from playback_backend import NullBackend
+from pygame_player import SoundPlayer
+
+FREQUENCY = 44100
+
+# 11025 frames per block: the simulated device pulls one block every 0.25 s. Clock steps are
+# multiples of 0.25 s so every tick time is exact in floating point.
+BUFFER_SIZE = 11025
+PERIOD = BUFFER_SIZE / FREQUENCY
+
+
+@pytest.fixture
+def player(tmp_path, monkeypatch):
+    # Keep the noise profile and other working files out of the repository
+    monkeypatch.chdir(tmp_path)
+
+    time = np.arange(FREQUENCY) / FREQUENCY
+    tone = (0.5 * np.iinfo(np.int16).max * np.sin(2 * np.pi * 440 * time)).astype(np.int16)
+    wavfile.write(str(tmp_path / "tone.wav"), FREQUENCY, np.column_stack([tone, tone]))
+
+    app = QApplication.instance() or QApplication([])
+    player = SoundPlayer(NullBackend(frequency=FREQUENCY, buffer_size=BUFFER_SIZE))
+    player.open_audio_path(str(tmp_path / "tone.wav"))
+    yield player
+    player.close()
+
+
+def test_blocks_are_pulled_as_the_clock_advances(player):
+    backend = player.backend
+    player.play_sound()
+    assert [block.start for block in backend.queued_blocks] == [0]
+
+    backend.clock.advance(0.5)
+    player.update_plot()
+
+    assert [block.start for block in backend.queued_blocks] == [0, BUFFER_SIZE, 2 * BUFFER_SIZE]
+    assert [block.time for block in backend.queued_blocks] == [0.0, 0.25, 0.5]
+    assert backend.start_latency(0.0) == 0.0
+
+
+def test_cursor_follows_the_clock(player):
+    player.play_sound()
+    for _ in range(3):
+        player.backend.clock.advance(0.25)
+        player.update_plot()
+
+    assert player.canvas.cursor_positions == [0.25, 0.5, 0.75]
+
+    # The cursor is inside the block the device is playing
+    last_block = player.backend.queued_blocks[-1]
+    assert last_block.time <= player.canvas.cursor_positions[-1] < last_block.time + PERIOD
+
+
+def test_stop_drops_and_pause_delays_pending_blocks(player):
+    backend = player.backend
+    player.play_sound()
+    backend.clock.advance(0.25)
+    player.update_plot()
+    assert len(backend.queued_blocks) == 2
+
+    player.toggle()
+    backend.clock.advance(0.5)
+    player.update_plot()
+    assert len(backend.queued_blocks) == 2
+
+    player.toggle()
+    backend.clock.advance(0.25)
+    player.update_plot()
+    assert len(backend.queued_blocks) == 3
+    assert backend.queued_blocks[-1].start == 2 * BUFFER_SIZE
+    assert backend.queued_blocks[-1].time == 1.0
+
+    player.stop_sound()
+    backend.clock.advance(1.0)
+    backend.pump()
+    assert len(backend.queued_blocks) == 3
+
+
+def test_volume_effect_output(player):
+    original = np.array(player.backend.samples(player.sound))
+    player.change_volume("0.5")
+    player.backend.clock.advance(1.0)
+
+    np.testing.assert_array_equal(player.backend.rendered(), np.multiply(original, 0.5).astype(np.int16))
+
+
+def test_seek_streams_bounded_windows(player, monkeypatch):
+    monkeypatch.setattr("pygame_player.SEEK_WINDOW_SECONDS", 0.5)
+    original = np.array(player.backend.samples(player.sound))
+
+    player.seek(0.25)
+    player.update_plot()
+    for _ in range(3):
+        player.backend.clock.advance(0.25)
+        player.update_plot()
+
+    # Every sound handed to the backend is at most one window long
+    assert max(block.sound.array.shape[0] for block in player.backend.queued_blocks) == 2 * BUFFER_SIZE
+    np.testing.assert_array_equal(player.backend.rendered(), original[BUFFER_SIZE:])
+    assert not player.is_playing
+
+
+def test_index_follows_the_current_sound(player):
+    player.play_reverse_sound()
+    audio_index = player.current_audio_index()
+
+    assert player.indexed_sound is player.sound
+    assert audio_index is player.current_audio_index()
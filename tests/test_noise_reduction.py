@@ -0,0 +1,89 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+import parallel_dsp
+from noise_reduction import NoiseProfile, learn_noise_profile, reduce_noise, _gate_block, _to_channels_first
+
+SAMPLE_RATE = 8000
+
+
+@pytest.fixture
+def noisy():
+    rng = np.random.default_rng(0)
+    time = np.arange(4 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = 0.5 * np.sin(2 * np.pi * 440 * time) * (time % 1 < 0.5)
+    noise = 0.01 * rng.standard_normal((len(time), 2))
+    return tone[:, np.newaxis] + noise
+
+
+@pytest.fixture
+def profile(noisy):
+    # The tone is off in the second half of every second
+    return learn_noise_profile(noisy[SAMPLE_RATE // 2:SAMPLE_RATE], SAMPLE_RATE)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Send even these short test signals to the worker pool
+    monkeypatch.setattr(parallel_dsp, "MIN_PARALLEL_SAMPLES", 0)
+    yield
+    parallel_dsp.shutdown_pool()
+
+
+def gate_whole(sound_data, profile):
+    x = _to_channels_first(sound_data)
+    return _gate_block(x, profile.threshold_db, profile.n_fft, profile.hop_length, 1.0, 2, 4).T
+
+
+def test_blocks_match_the_whole_signal(noisy, profile):
+    cleaned = reduce_noise(noisy, profile, block_seconds=0.5, workers=1)
+
+    assert cleaned.shape == noisy.shape
+    np.testing.assert_allclose(cleaned, gate_whole(noisy, profile), atol=1e-9)
+
+
+def test_segments_match_the_whole_signal(noisy, profile, pool):
+    single = reduce_noise(noisy, profile, block_seconds=0.5, workers=1)
+    parallel = reduce_noise(noisy, profile, block_seconds=0.5, workers=3)
+
+    np.testing.assert_allclose(parallel, single, atol=1e-9)
+    np.testing.assert_allclose(parallel, gate_whole(noisy, profile), atol=1e-9)
+
+
+@pytest.mark.parametrize("frames", [1, 1000, 1500, 2047])
+def test_sounds_shorter_than_one_window(profile, frames):
+    sound_data = (np.arange(frames * 2).reshape(frames, 2) % 100).astype(np.int16)
+
+    cleaned = reduce_noise(sound_data, profile)
+
+    assert cleaned.shape == sound_data.shape
+    assert cleaned.dtype == np.int16
+
+
+def test_profile_round_trip(profile, tmp_path):
+    path = str(tmp_path / "profile.npz")
+    profile.save(path)
+
+    loaded = NoiseProfile.load(path)
+
+    np.testing.assert_array_equal(loaded.threshold_db, profile.threshold_db)
+    assert (loaded.sample_rate, loaded.n_fft, loaded.hop_length) == \
+        (profile.sample_rate, profile.n_fft, profile.hop_length)
+
+
+def test_unreadable_profile_is_ignored(profile, tmp_path):
+    assert NoiseProfile.load(str(tmp_path / "missing.npz")) is None
+
+    path = tmp_path / "profile.npz"
+    profile.save(str(path))
+    path.write_bytes(path.read_bytes()[:100])
+    assert NoiseProfile.load(str(path)) is None
+
+    # A profile from an older version without the STFT parameters
+    np.savez(str(path), threshold_db=profile.threshold_db)
+    assert NoiseProfile.load(str(path)) is None
+
+    path.write_bytes(b"")
+    assert NoiseProfile.load(str(path)) is None
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+import scipy.signal as signal
+
+import parallel_dsp
+from effects import filtfilt_kernel, resample_kernel
+from parallel_dsp import process_channels
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # Send even these short test signals to the worker pool
+    monkeypatch.setattr(parallel_dsp, "MIN_PARALLEL_SAMPLES", 0)
+    yield
+    parallel_dsp.shutdown_pool()
+
+
+@pytest.fixture(params=[(5000,), (5000, 3)], ids=["mono", "multichannel"])
+def sound_data(request):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(request.param) * 1000).astype(np.int16)
+
+
+def test_filtfilt_in_the_pool(pool, sound_data):
+    b, a = signal.butter(4, 0.1)
+
+    result = process_channels(filtfilt_kernel, sound_data, workers=2, b=b, a=a)
+
+    np.testing.assert_allclose(result, signal.filtfilt(b, a, sound_data.astype(np.float64), axis=0))
+
+
+def test_resample_in_the_pool(pool, sound_data):
+    num = 7000
+
+    result = process_channels(resample_kernel, sound_data, out_samples=num, workers=2, num=num)
+
+    assert result.shape == (num,) + sound_data.shape[1:]
+    np.testing.assert_allclose(result, signal.resample(sound_data.astype(np.float64), num, axis=0))
+
+
+def test_segments_cover_the_whole_signal():
+    assert parallel_dsp._split(10, 3, overlap=2, align=2) == \
+        [(0, 6, 0, 4), (2, 10, 4, 8), (6, 10, 8, 10)]